@@ -227,9 +227,9 @@ class EventAnalyzer {
             await this.processBaseGameFolder(folder);
         }
         
-        // 如果是DLC初阳文件夹且没有找到文件，尝试通过fetch API读取
-        if (folder.name === '初阳' && folderFiles.length === 0) {
-            console.log('[Analyzer] 尝试通过fetch API读取DLC初阳文件夹中的文件');
+        // 如果是自动添加的DLC文件夹且没有找到文件，尝试通过fetch API读取
+        if (folder.isDlc && folderFiles.length === 0) {
+            console.log(`[Analyzer] 尝试通过fetch API读取DLC ${folder.name} 文件夹中的文件`);
             await this.processDlcFolder(folder);
         }
         
@@ -306,23 +306,30 @@ class EventAnalyzer {
     }
     
     /**
-     * 处理DLC初阳文件夹（通过fetch API）
-     * @param {Object} folder - 文件夹信息
+     * 处理DLC文件夹（通过fetch API）
+     * @param {Object} folder - 文件夹信息（dlcFiles为服务器DLC清单中的文件列表）
      */
     async processDlcFolder(folder) {
-        // 尝试读取DLC初阳文件夹中的文件，使用folder.fullPath确保路径正确
+        // 尝试读取DLC文件夹中的文件，使用folder.fullPath确保路径正确
         const cfgDir = `${folder.fullPath}/Cfgs/zh-cn/`;
         
         try {
-            // 首先尝试列出目录内容
-            console.log(`[Analyzer] 尝试列出 ${cfgDir} 目录内容`);
-            const dirResponse = await fetch(cfgDir);
-            console.log(`[Analyzer] 目录请求状态码: ${dirResponse.status}`);
-            if (dirResponse.ok) {
-                const dirContent = await dirResponse.text();
-                console.log(`[Analyzer] 目录内容长度: ${dirContent.length}`);
-                // 从目录内容中提取文件名
-                const fileNames = Utils.extractFileNamesFromDirContent(dirContent);
+            let fileNames = folder.dlcFiles;
+            if (!fileNames) {
+                // 没有DLC清单时列出目录内容
+                console.log(`[Analyzer] 尝试列出 ${cfgDir} 目录内容`);
+                const dirResponse = await fetch(cfgDir);
+                console.log(`[Analyzer] 目录请求状态码: ${dirResponse.status}`);
+                if (dirResponse.ok) {
+                    const dirContent = await dirResponse.text();
+                    // 从目录内容中提取文件名
+                    fileNames = Utils.extractFileNamesFromDirContent(dirContent);
+                } else {
+                    console.warn(`[Analyzer] 无法列出目录内容，状态码: ${dirResponse.status}`);
+                }
+            }
+            
+            if (fileNames) {
                 console.log(`[Analyzer] 找到 ${fileNames.length} 个文件:`, fileNames);
                 
                 // 遍历所有支持的ID类型，尝试读取对应文件
@@ -362,11 +369,9 @@ class EventAnalyzer {
                         console.warn(`[Analyzer] 处理类型 ${type} 时出错:`, error);
                     }
                 }
-            } else {
-                console.warn(`[Analyzer] 无法列出目录内容，状态码: ${dirResponse.status}`);
             }
         } catch (error) {
-            console.warn(`[Analyzer] 处理DLC初阳文件夹时出错:`, error);
+            console.warn(`[Analyzer] 处理DLC ${folder.name} 文件夹时出错:`, error);
         }
     }
     
@@ -78,7 +78,7 @@ class ModEventApp {
         
         // 自动添加baseGame文件夹到待解析列表（如果配置启用）
         this.autoAddBaseGameFolder();
-        // 自动添加DLC初阳文件夹到待解析列表（如果配置启用）
+        // 自动添加所有已发现的DLC文件夹到待解析列表（如果配置启用）
         this.autoAddDlcFolder();
         
         // 绑定事件
@@ -252,45 +252,48 @@ class ModEventApp {
     }
 
     /**
-     * 根据配置自动添加DLC初阳文件夹到待解析列表
+     * 根据配置自动添加所有已发现的DLC文件夹到待解析列表
+     * DLC由服务器自动发现（dlc/<DLC名称>/Cfgs/<语言>），disabledDlcs中的DLC会被跳过
      */
-    autoAddDlcFolder() {
-        if (this.config.includeDlcContent) {
-            console.log('[App] 自动添加DLC初阳文件夹到待解析列表');
-            // 检查DLC初阳文件夹是否存在
-            fetch('dlc/初阳/')
-                .then(response => {
-                    if (response.ok) {
-                        console.log('[App] 检测到DLC初阳文件夹存在');
-                        // 先检查是否已经有DLC初阳文件夹
-                        const currentFolders = this.uploader.getSelectedFolders();
-                        const hasDlc = currentFolders.some(folder => folder.name === '初阳');
-                        if (!hasDlc) {
-                            // 创建DLC初阳文件夹对象
-                            const dlcFolder = {
-                                name: '初阳',
-                                fullPath: 'dlc/初阳',
-                                file: null
-                            };
-                            // 手动添加到uploader的selectedFolders中
-                            this.uploader.selectedFolders.set('初阳', dlcFolder);
-                            // 更新UI显示
-                            if (this.renderer) {
-                                this.renderer.updateFolderStats(Array.from(this.uploader.selectedFolders.values()));
-                            }
-                            console.log('[App] DLC初阳文件夹已添加到待解析列表');
-                        } else {
-                            console.log('[App] DLC初阳文件夹已存在于待解析列表中');
-                        }
-                    } else {
-                        console.log('[App] DLC初阳文件夹不存在');
-                    }
-                })
-                .catch(error => {
-                    console.log('[App] 检查DLC初阳文件夹时出错:', error.message);
-                });
-        } else {
-            console.log('[App] 配置为不自动添加DLC初阳文件夹');
+    async autoAddDlcFolder() {
+        if (!this.config.includeDlcContent) {
+            console.log('[App] 配置为不自动添加DLC文件夹');
+            return;
+        }
+        
+        try {
+            const manifest = await this.idDatabase.loadDlcManifest();
+            const disabledDlcs = this.config.disabledDlcs || [];
+            
+            for (const dlc of manifest.dlcs) {
+                if (disabledDlcs.includes(dlc.name)) {
+                    console.log(`[App] DLC ${dlc.name} 已在配置中禁用`);
+                    continue;
+                }
+                if (this.uploader.selectedFolders.has(dlc.name)) {
+                    console.log(`[App] DLC ${dlc.name} 已存在于待解析列表中`);
+                    continue;
+                }
+                // 创建DLC文件夹对象，dlcFiles为清单中的文件列表（无清单时为null，由分析器读取目录列表）
+                const langInfo = dlc.langs && dlc.langs[this.idDatabase.dlcLang];
+                const dlcFolder = {
+                    name: dlc.name,
+                    fullPath: dlc.path,
+                    file: null,
+                    isDlc: true,
+                    dlcFiles: langInfo ? langInfo.files : null
+                };
+                // 手动添加到uploader的selectedFolders中
+                this.uploader.selectedFolders.set(dlc.name, dlcFolder);
+                console.log(`[App] DLC ${dlc.name} 已添加到待解析列表`);
+            }
+            
+            // 更新UI显示
+            if (this.renderer) {
+                this.renderer.updateFolderStats(Array.from(this.uploader.selectedFolders.values()));
+            }
+        } catch (error) {
+            console.log('[App] 检查DLC文件夹时出错:', error.message);
         }
     }
 
@@ -557,12 +560,18 @@ class ModEventApp {
             includeOfficialContentCheckbox.checked = this.config.includeOfficialContent;
         }
         
-        // 自动添加DLC初阳文件夹
+        // 自动添加DLC文件夹
         const includeDlcContentCheckbox = document.getElementById('include-dlc-content');
         if (includeDlcContentCheckbox) {
             includeDlcContentCheckbox.checked = this.config.includeDlcContent;
         }
         
+        // 分析后校验字段规则
+        const validateSchemaCheckbox = document.getElementById('validate-schema');
+        if (validateSchemaCheckbox) {
+            validateSchemaCheckbox.checked = this.config.validateSchema;
+        }
+        
         // 自动加载默认数据
         const autoLoadDefaultDataCheckbox = document.getElementById('auto-load-default-data');
         if (autoLoadDefaultDataCheckbox) {
@@ -908,6 +917,7 @@ class ModEventApp {
         const includeOfficialContent = document.getElementById('include-official-content').checked;
         const includeDlcContent = document.getElementById('include-dlc-content').checked;
         const autoLoadDefaultData = document.getElementById('auto-load-default-data').checked;
+        const validateSchema = document.getElementById('validate-schema').checked;
         const developerMode = document.getElementById('developer-mode').checked;
         const opacity = parseInt(document.getElementById('opacity-slider').value) || 85;
         const verticalPageSize = parseInt(document.getElementById('vertical-page-size').value) || 50;
@@ -938,6 +948,7 @@ class ModEventApp {
             includeOfficialContent,
             includeDlcContent,
             autoLoadDefaultData,
+            validateSchema,
             opacity,
             verticalPageSize,
             horizontalPageSize,
@@ -978,15 +989,16 @@ class ModEventApp {
             }
         }
         
-        // 根据新的includeDlcContent设置重新处理DLC初阳文件夹
+        // 根据新的includeDlcContent设置重新处理DLC文件夹
         if (this.config.includeDlcContent) {
             this.autoAddDlcFolder();
         } else {
-            // 如果关闭了自动添加，移除已添加的DLC初阳文件夹
+            // 如果关闭了自动添加，移除所有已添加的DLC文件夹（倒序移除，避免索引变化）
             const currentFolders = this.uploader.getSelectedFolders();
-            const dlcIndex = currentFolders.findIndex(folder => folder.name === '初阳');
-            if (dlcIndex !== -1) {
-                this.uploader.removeFolder(dlcIndex);
+            for (let i = currentFolders.length - 1; i >= 0; i--) {
+                if (currentFolders[i].isDlc) {
+                    this.uploader.removeFolder(i);
+                }
             }
         }
         
@@ -1340,8 +1352,19 @@ class ModEventApp {
             return; // 用户取消导出
         }
         
+        // 优先由本地服务器流式生成报告，避免大报告卡住页面
+        if (this.lastResult && window.location.protocol !== 'file:') {
+            const exported = await this.exportFromServer(exportFormat);
+            if (exported) {
+                return;
+            }
+        }
+        
         // 根据选择的格式导出报告
         switch (exportFormat) {
+            case 'csv':
+                alert('CSV报告需要通过start_server启动的本地服务器导出');
+                break;
             case 'json':
                 this.exportAsJSON();
                 break;
@@ -1352,6 +1375,97 @@ class ModEventApp {
         }
     }
     
+    /**
+     * 从分析结果构建冲突索引，只包含重复ID及其所在模组
+     * @param {Object} result 分析结果
+     * @param {boolean} detailed 是否包含每条冲突记录的关键属性
+     * @returns {Object} 冲突索引
+     */
+    buildConflictIndex(result, detailed) {
+        const { idTypes, modDetails } = result;
+        const conflictIndex = {
+            generatedAt: new Date().toISOString(),
+            totalMods: result.totalMods,
+            mods: {},
+            types: {}
+        };
+        
+        for (const [modName, modDetail] of modDetails.entries()) {
+            conflictIndex.mods[modName] = {
+                title: modDetail.title || modName,
+                path: modDetail.path
+            };
+        }
+        
+        for (const type in idTypes) {
+            const duplicateIds = result[`duplicate${type.charAt(0).toUpperCase() + type.slice(1)}Ids`] || [];
+            if (duplicateIds.length === 0) continue;
+            
+            // 按模组建立 id => 记录 的索引，避免逐条查找
+            const recordMaps = new Map();
+            const getRecord = (modName, id) => {
+                if (!recordMaps.has(modName)) {
+                    const records = modDetails.get(modName)[`${type}s`] || [];
+                    recordMaps.set(modName, new Map(records.map(record => [record.id, record])));
+                }
+                return recordMaps.get(modName).get(id) || {};
+            };
+            
+            conflictIndex.types[type] = {
+                displayName: idTypes[type].displayName,
+                keyList: idTypes[type].keyList,
+                conflicts: duplicateIds.map(([id, modNames]) => {
+                    const conflict = { id, mods: Array.from(modNames) };
+                    if (detailed) {
+                        conflict.records = {};
+                        for (const modName of conflict.mods) {
+                            conflict.records[modName] = getRecord(modName, id);
+                        }
+                    }
+                    return conflict;
+                })
+            };
+        }
+        
+        return conflictIndex;
+    }
+    
+    /**
+     * 上传冲突索引并由服务器流式生成报告，浏览器直接下载
+     * @param {string} exportFormat 导出格式（markdown/json/csv）
+     * @returns {Promise<boolean>} 是否成功
+     */
+    async exportFromServer(exportFormat) {
+        const detailed = configManager.get('generateDetailedReport') !== false;
+        
+        try {
+            const response = await fetch('/report-session', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify(this.buildConflictIndex(this.lastResult, detailed))
+            });
+            if (!response.ok) {
+                return false;
+            }
+            const { token } = await response.json();
+            
+            // 由浏览器直接下载，报告内容不经过页面内存
+            const link = document.createElement('a');
+            link.href = `/export-report?token=${token}&format=${exportFormat}&detailed=${detailed ? 1 : 0}`;
+            link.download = '';
+            link.style.display = 'none';
+            document.body.appendChild(link);
+            link.click();
+            document.body.removeChild(link);
+            return true;
+        } catch (error) {
+            console.warn('[App] 服务器导出报告失败，改为浏览器导出:', error);
+            return false;
+        }
+    }
+    
     /**
      * 显示导出格式选择对话框
      * @returns {string|null} 选择的导出格式，取消则返回null
@@ -1434,6 +1548,26 @@ class ModEventApp {
                                 <div style="font-size: var(--font-size-sm); color: var(--text-secondary);">原始数据，适合进一步处理和分析</div>
                             </div>
                         </label>
+                        <label style="
+                            display: flex;
+                            align-items: center;
+                            gap: var(--spacing-md);
+                            padding: var(--spacing-md);
+                            border: 2px solid var(--border-color);
+                            border-radius: var(--border-radius-md);
+                            cursor: pointer;
+                            transition: all var(--transition-base);
+                        " data-format="csv">
+                            <input type="radio" name="export-format" value="csv" style="
+                                width: 20px;
+                                height: 20px;
+                                accent-color: var(--primary-color);
+                            ">
+                            <div style="flex: 1;">
+                                <div style="font-weight: var(--font-weight-bold); color: var(--text-primary);">CSV表格</div>
+                                <div style="font-size: var(--font-size-sm); color: var(--text-secondary);">每行一条冲突记录，适合用表格软件筛选（需要本地服务器）</div>
+                            </div>
+                        </label>
                     </div>
                     <div style="
                         display: flex;
@@ -1828,15 +1962,29 @@ class ModEventApp {
             this.updateProgressBar('加载用户上传文件到数据库...', 10);
             await this.loadUserFilesToDatabase(allFiles);
             
+            // 只为参与分析的DLC加载ID索引分片
+            const dlcNames = folders.filter(folder => folder.isDlc).map(folder => folder.name);
+            await this.idDatabase.setEnabledDlcs(dlcNames);
+            this.updateProgressBar('加载DLC索引...', 45);
+            await Promise.all(dlcNames.map(dlcName => this.idDatabase.loadDlcShards(dlcName)));
+            
             // 开始分析
             this.updateProgressBar('开始分析...', 50);
             const result = await this.analyzer.analyze(folders, allFiles);
             
+            // 保存分析结果，供导出报告使用
+            this.lastResult = result;
+            
             // 显示成功进度条
             this.showSuccessProgressBar('分析完成！');
             
             // 渲染结果
             this.renderer.renderResults(result);
+            
+            // 校验字段规则（不阻塞结果显示）
+            if (this.config.validateSchema) {
+                this.runSchemaValidation(result);
+            }
         } catch (error) {
             console.error('分析出错:', error);
             // 显示错误进度条
@@ -1845,6 +1993,33 @@ class ModEventApp {
         }
     }
     
+    /**
+     * 按idTypeKeys.json校验所有模组的字段，结果流式显示
+     * @param {Object} result 分析结果
+     */
+    async runSchemaValidation(result) {
+        if (!window.schemaValidator) {
+            return;
+        }
+        
+        this.renderer.resetValidationResults();
+        
+        try {
+            const startTime = performance.now();
+            const summary = await window.schemaValidator.validate(result.modDetails, {
+                onFindings: (findings) => this.renderer.appendValidationFindings(findings)
+            });
+            console.log(`[App] 字段规则校验完成，耗时 ${Math.round(performance.now() - startTime)}ms:`, summary);
+            this.renderer.renderValidationSummary(summary);
+        } catch (error) {
+            if (error.name === 'AbortError') {
+                // 新的分析开始了新的校验，本次结果作废
+                return;
+            }
+            console.error('[App] 字段规则校验出错:', error);
+        }
+    }
+    
     /**
      * 加载用户上传的文件到数据库
      * @param {File[]} files 用户上传的文件列表
@@ -61,8 +61,10 @@ class ConfigManager {
             developerPassword: "", // 开发者模式密码
             opacity: 85, // 页面透明度，默认85%
             includeOfficialContent: true, // 是否自动添加baseGame文件夹到待解析列表
-            includeDlcContent: true, // 是否自动添加dlc/初阳文件夹到待解析列表
+            includeDlcContent: true, // 是否自动添加dlc目录下发现的所有DLC到待解析列表
+            disabledDlcs: [], // 不自动添加的DLC名称列表（dlc目录下的文件夹名）
             autoLoadDefaultData: false, // 是否每次启动自动加载默认数据
+            validateSchema: false, // 分析后是否按idTypeKeys.json校验字段规则（默认关闭）
             verticalPageSize: 50, // 竖列表格每页数量
             horizontalPageSize: 50 // 横列表格每页数量
         };
@@ -390,7 +392,7 @@ class ConfigManager {
         }
         
         // 验证exportFormat
-        if (!['json', 'markdown'].includes(this.config.exportFormat)) {
+        if (!['json', 'markdown', 'csv'].includes(this.config.exportFormat)) {
             console.warn('[Config] exportFormat值无效，使用默认值markdown');
             this.config.exportFormat = 'markdown';
         }
@@ -409,6 +411,13 @@ class ConfigManager {
         this.config.includeOfficialContent = Boolean(this.config.includeOfficialContent);
         this.config.includeDlcContent = Boolean(this.config.includeDlcContent);
         this.config.autoLoadDefaultData = Boolean(this.config.autoLoadDefaultData);
+        this.config.validateSchema = Boolean(this.config.validateSchema);
+        
+        // 验证disabledDlcs
+        if (!Array.isArray(this.config.disabledDlcs)) {
+            console.warn('[Config] disabledDlcs值无效，使用默认值[]');
+            this.config.disabledDlcs = [];
+        }
         
         // 验证分页配置
         if (typeof this.config.verticalPageSize !== 'number' || this.config.verticalPageSize < 1 || this.config.verticalPageSize > 1000) {
@@ -30,6 +30,34 @@ class IdDatabase {
         };
         // 进度更新回调
         this.onProgressUpdate = null;
+        // DLC清单（由服务器的/dlc-index提供）
+        this.dlcManifest = null;
+        // 已启用的DLC名称
+        this.enabledDlcs = new Set();
+        // 已加载或正在加载的DLC分片: Map<"dlc/lang/type", Promise<boolean>>
+        this.dlcShards = new Map();
+        // DLC分片使用的语言目录
+        this.dlcLang = 'zh-cn';
+        // 是否已按分片与服务器同步（/id-sync），为false时使用整体存储
+        this.syncEnabled = false;
+        // 本地分片版本: Map<"type|source", version>
+        this.shardVersions = new Map();
+        // 已载入数据库的DLC分片: Map<"type|source", { dlc, type }>，未启用的DLC分片只存储不载入
+        this.activeDlcShards = new Map();
+        // 分片同步时按类型串行执行分片写入与重建: Map<type, Promise>
+        this.typeLocks = new Map();
+        // 未使用分片同步时DLC分片的记录: Map<"type|source", { type, source, records, timestamp }>
+        this.dlcShardRecords = new Map();
+        // 未使用分片同步时，载入过DLC的类型不含DLC的数据: Map<type, { database, sources }>
+        // 持久化时使用这份数据，DLC记录不会写入整体存储
+        this.baseMaps = new Map();
+        // 各来源分片的优先级，同一ID以优先级高的为准（与加载顺序一致）
+        this.shardPriority = {
+            default: 0,
+            baseGame: 1,
+            dlc: 2,
+            user: 3
+        };
     }
     
     /**
@@ -131,8 +159,10 @@ class IdDatabase {
                 // 加载baseGame数据
                 this.updateProgress('加载baseGame数据...', 70);
                 await this.loadBaseGameData();
+            } else if (await this.syncFromServer()) {
+                // 已按分片与服务器同步，只下载了变化的分片
             } else {
-                // 尝试从存储中恢复数据
+                // 服务器不支持分片同步，尝试从存储中恢复数据
                 this.updateProgress('恢复数据库数据...', 30);
                 const restored = await this.restoreFromStorage();
                 
@@ -179,8 +209,8 @@ class IdDatabase {
             // 检查是否需要自动加载默认数据
         const autoLoadDefaultData = window.configManager ? window.configManager.get('autoLoadDefaultData') : false;
         
-        // 只有在autoLoadDefaultData为false时才持久化数据
-        if (!autoLoadDefaultData) {
+        // 只有在autoLoadDefaultData为false时才持久化数据（分片同步时各分片已单独存储）
+        if (!autoLoadDefaultData && !this.syncEnabled) {
             await this.persistToStorage();
         }
             
@@ -429,6 +459,254 @@ class IdDatabase {
         }
     }
     
+    /**
+     * 加载DLC清单，自动发现所有dlc/<DLC名称>/Cfgs/<语言>目录
+     * 服务器不支持/dlc-index时（如python -m http.server），回退为解析dlc/目录列表
+     * @returns {Promise<Object>} 清单 { dlcs: [{ name, path, langs }] }
+     */
+    async loadDlcManifest() {
+        if (this.dlcManifest) {
+            return this.dlcManifest;
+        }
+        
+        try {
+            const response = await fetch('/dlc-index', {
+                cache: 'no-cache'
+            });
+            if (response.ok) {
+                this.dlcManifest = await response.json();
+                return this.dlcManifest;
+            }
+        } catch (error) {
+            // 忽略，使用目录列表回退
+        }
+        
+        const dlcs = [];
+        try {
+            const response = await fetch('dlc/', {
+                cache: 'no-cache'
+            });
+            if (response.ok) {
+                const dirContent = await response.text();
+                const regex = /href="([^"?]+)\/"/g;
+                let match;
+                while ((match = regex.exec(dirContent)) !== null) {
+                    const name = decodeURIComponent(match[1]);
+                    if (!name.startsWith('.') && !name.includes('/')) {
+                        // 没有类型信息，由分析器自行读取目录列表
+                        dlcs.push({ name, path: `dlc/${name}`, langs: null });
+                    }
+                }
+            }
+        } catch (error) {
+            console.warn('[IdDatabase] 读取dlc目录失败:', error);
+        }
+        this.dlcManifest = { dlcs };
+        return this.dlcManifest;
+    }
+    
+    /**
+     * 设置已启用（参与分析）的DLC，只有启用的DLC会加载分片
+     * 已载入但不再启用的DLC分片会被移除，并重建受影响的类型
+     * @param {Array<string>} dlcNames DLC名称列表
+     */
+    async setEnabledDlcs(dlcNames) {
+        this.enabledDlcs = new Set(dlcNames);
+
+        const affectedTypes = new Set();
+        for (const [key, info] of this.activeDlcShards) {
+            if (!this.enabledDlcs.has(info.dlc)) {
+                this.activeDlcShards.delete(key);
+                this.dlcShardRecords.delete(key);
+                // 再次启用时重新加载
+                this.dlcShards.delete(`${info.dlc}/${this.dlcLang}/${info.type}`);
+                affectedTypes.add(info.type);
+            }
+        }
+        await Promise.all(Array.from(affectedTypes).map(type => this.rebuildType(type)));
+    }
+
+    /**
+     * 按当前已载入的DLC分片重建某个类型
+     * @param {string} type ID类型
+     */
+    async rebuildType(type) {
+        if (this.syncEnabled) {
+            await this.withTypeLock(type, async () => {
+                const shards = await this.getShardsFromIndexedDB(type);
+                if (shards) {
+                    this.rebuildFromShards(shards, type);
+                }
+            });
+        } else {
+            this.rebuildTypeInMemory(type);
+        }
+    }
+
+    /**
+     * 未使用分片同步时，由不含DLC的数据加上已载入的DLC分片重建某个类型
+     * @param {string} type ID类型
+     */
+    rebuildTypeInMemory(type) {
+        const base = this.baseMaps.get(type);
+        if (!base) {
+            return;
+        }
+        const typeConfig = this.idTypes[type];
+        const idMap = new Map(base.database);
+        const sourceList = [...base.sources];
+
+        for (const [key, shard] of this.dlcShardRecords) {
+            if (shard.type !== type || !this.activeDlcShards.has(key)) {
+                continue;
+            }
+            this.batchAddToMap(idMap, shard.records.map(([id, name]) => ({
+                id,
+                name: name || typeConfig.displayName || id
+            })));
+            sourceList.push({
+                source: shard.source,
+                type: 'dlc',
+                timestamp: shard.timestamp
+            });
+        }
+
+        this.database.set(type, idMap);
+        this.sources.set(type, sourceList);
+    }
+    
+    /**
+     * 获取某个DLC在指定语言下包含的ID类型
+     * @param {string} dlcName DLC名称
+     * @returns {Array<string>} 类型列表
+     */
+    getDlcTypes(dlcName) {
+        const dlc = this.dlcManifest && this.dlcManifest.dlcs.find(d => d.name === dlcName);
+        if (!dlc || !dlc.langs || !dlc.langs[this.dlcLang]) {
+            return [];
+        }
+        return Object.keys(dlc.langs[this.dlcLang].types).filter(type => this.idTypes[type]);
+    }
+    
+    /**
+     * 加载单个DLC分片（某个DLC的某个类型），同一分片只请求一次
+     * @param {string} dlcName DLC名称
+     * @param {string} type ID类型
+     * @returns {Promise<boolean>} 加载是否成功
+     */
+    ensureDlcShard(dlcName, type) {
+        const key = `${dlcName}/${this.dlcLang}/${type}`;
+        if (!this.dlcShards.has(key)) {
+            const loading = this.loadDlcShard(dlcName, type).then(loaded => {
+                // 加载失败时移除缓存，下次可以重试
+                if (!loaded && this.dlcShards.get(key) === loading) {
+                    this.dlcShards.delete(key);
+                }
+                return loaded;
+            });
+            this.dlcShards.set(key, loading);
+        }
+        return this.dlcShards.get(key);
+    }
+    
+    /**
+     * 请求DLC分片并合并到数据库
+     * @param {string} dlcName DLC名称
+     * @param {string} type ID类型
+     * @returns {Promise<boolean>} 加载是否成功
+     */
+    async loadDlcShard(dlcName, type) {
+        try {
+            const params = new URLSearchParams({ dlc: dlcName, lang: this.dlcLang, type });
+            // 键与服务器返回的source一致
+            const key = `${type}|dlc/${dlcName}/Cfgs/${this.dlcLang}`;
+            const knownVersion = this.shardVersions.get(key);
+            if (knownVersion) {
+                params.set('version', knownVersion);
+            }
+            const response = await fetch(`/dlc-shard?${params}`);
+            if (!response.ok) {
+                return false;
+            }
+            const shard = await response.json();
+            if (this.syncEnabled) {
+                return await this.activateDlcShard(key, dlcName, type, shard);
+            }
+
+            // 保留不含DLC的数据，DLC记录只存在于内存中，不写入整体存储
+            if (!this.baseMaps.has(type)) {
+                this.baseMaps.set(type, {
+                    database: new Map(this.database.get(type)),
+                    sources: [...this.sources.get(type)]
+                });
+            }
+            this.dlcShardRecords.set(key, {
+                type,
+                source: shard.source,
+                records: shard.records,
+                timestamp: new Date().toISOString()
+            });
+            this.activeDlcShards.set(key, { dlc: dlcName, type });
+            this.rebuildTypeInMemory(type);
+            return true;
+        } catch (error) {
+            console.warn(`[IdDatabase] 加载DLC分片 ${dlcName}/${type} 失败:`, error);
+            return false;
+        }
+    }
+    
+    /**
+     * 分片同步时载入DLC分片：版本未变时使用本地存储的副本，否则先存储新版本
+     * @param {string} key 分片键
+     * @param {string} dlcName DLC名称
+     * @param {string} type ID类型
+     * @param {Object} shard /dlc-shard的响应
+     * @returns {Promise<boolean>} 载入是否成功
+     */
+    activateDlcShard(key, dlcName, type, shard) {
+        // 多个DLC提供同一类型时串行执行，避免读取分片后被另一个DLC的重建覆盖
+        return this.withTypeLock(type, async () => {
+            if (!shard.unchanged) {
+                const stored = await this.updateShardsInIndexedDB([
+                    this.createShard(type, shard.source, 'dlc', shard.version, shard.records)
+                ]);
+                if (!stored) {
+                    return false;
+                }
+            }
+
+            const shards = await this.getShardsFromIndexedDB(type);
+            if (!shards) {
+                return false;
+            }
+            this.activeDlcShards.set(key, { dlc: dlcName, type });
+            // 按优先级重建该类型，旧版本分片中已删除的ID也随之移除
+            this.rebuildFromShards(shards, type);
+            return true;
+        });
+    }
+
+    /**
+     * 在某个类型上串行执行任务，前一个任务失败不影响后续任务
+     * @param {string} type ID类型
+     * @param {Function} task 返回Promise的任务
+     * @returns {Promise<*>} 任务的结果
+     */
+    withTypeLock(type, task) {
+        const previous = this.typeLocks.get(type) || Promise.resolve();
+        const next = previous.then(task, task);
+        this.typeLocks.set(type, next.catch(() => {}));
+        return next;
+    }
+    
+    /**
+     * 加载某个DLC的全部分片（DLC被启用并参与分析时调用）
+     * @param {string} dlcName DLC名称
+     */
+    async loadDlcShards(dlcName) {
+        await Promise.all(this.getDlcTypes(dlcName).map(type => this.ensureDlcShard(dlcName, type)));
+    }
+    
     /**
      * 从用户上传的文件加载数据
      * @param {File} file 用户上传的文件
@@ -448,7 +726,8 @@ class IdDatabase {
             
             // 处理数据
             await this.processData(type, jsonData, { 
-                source: `user_upload/${file.name}`,
+                // 上传MOD文件夹时webkitRelativePath以MOD文件夹开头，不同MOD的同名文件不会共用一个分片
+                source: `user_upload/${file.webkitRelativePath || file.name}`,
                 type: 'user'
             });
             
@@ -467,20 +746,42 @@ class IdDatabase {
      * @param {Object} sourceInfo 数据来源信息
      */
     async processData(type, jsonData, sourceInfo) {
+        if (this.syncEnabled) {
+            // 与同类型的DLC分片载入串行执行，避免重建时丢失该来源的ID
+            return this.withTypeLock(type, () => this.addData(type, jsonData, sourceInfo));
+        }
+        return this.addData(type, jsonData, sourceInfo);
+    }
+
+    /**
+     * 将数据添加到数据库并持久化
+     * @param {string} type ID类型
+     * @param {Object} jsonData JSON数据
+     * @param {Object} sourceInfo 数据来源信息
+     */
+    async addData(type, jsonData, sourceInfo) {
         const typeConfig = this.idTypes[type];
         const idMap = this.database.get(type);
         const sourceList = this.sources.get(type);
+        // 未使用分片同步且该类型已载入DLC时，同时写入不含DLC的数据
+        const base = this.syncEnabled ? null : this.baseMaps.get(type);
         
         // 记录数据来源
-        sourceList.push({
+        const sourceEntry = {
             ...sourceInfo,
             timestamp: new Date().toISOString()
-        });
+        };
+        sourceList.push(sourceEntry);
+        if (base) {
+            base.sources.push(sourceEntry);
+        }
         
         // 批量处理数据，减少Map操作开销
         const batchSize = 1000; // 每批次处理1000条数据
         let batch = [];
-        
+        // 分片同步时，该来源单独存储为一个分片
+        const records = [];
+
         for (const [key, data] of Object.entries(jsonData)) {
             if (data && typeof data === 'object') {
                 const idField = typeConfig.getIdField;
@@ -503,10 +804,16 @@ class IdDatabase {
                     };
                     
                     batch.push(item);
-                    
+                    if (this.syncEnabled) {
+                        records.push([item.id, item.name]);
+                    }
+
                     // 当批次达到指定大小时，批量处理
                     if (batch.length >= batchSize) {
                         this.batchAddToMap(idMap, batch);
+                        if (base) {
+                            this.batchAddToMap(base.database, batch);
+                        }
                         batch = [];
                     }
                 }
@@ -516,28 +823,165 @@ class IdDatabase {
         // 处理剩余数据
         if (batch.length > 0) {
             this.batchAddToMap(idMap, batch);
+            if (base) {
+                this.batchAddToMap(base.database, batch);
+            }
         }
         
         // 数据更新后持久化到存储（根据标志决定是否需要持久化）
-        if (this.shouldPersist) {
+        if (this.syncEnabled) {
+            // 只写入该来源的分片，不再序列化整个数据库
+            await this.updateShardsInIndexedDB([
+                this.createShard(type, sourceInfo.source, sourceInfo.type, null, records)
+            ]);
+        } else if (this.shouldPersist) {
             await this.persistToStorage();
         }
     }
+
+    /**
+     * 创建用于IndexedDB存储的分片
+     * @param {string} type ID类型
+     * @param {string} source 数据来源
+     * @param {string} sourceType 来源类型（default/baseGame/dlc/user）
+     * @param {string|null} version 服务器下发的版本，本地上传的数据为null
+     * @param {Array<Array>} records [id, name]数组
+     * @returns {Object} 分片
+     */
+    createShard(type, source, sourceType, version, records) {
+        return {
+            key: `${type}|${source}`,
+            type,
+            source,
+            sourceType,
+            priority: this.shardPriority[sourceType] ?? this.shardPriority.user,
+            version,
+            records,
+            updatedAt: new Date().toISOString()
+        };
+    }
+
+    /**
+     * 与服务器增量同步分片（/id-sync）并重建数据库
+     * 只下载版本变化的分片，本地只写入变化的分片
+     * @returns {Promise<boolean>} 同步是否成功，失败时回退到整体存储
+     */
+    async syncFromServer() {
+        try {
+            const stored = await this.getShardsFromIndexedDB();
+            if (!stored) {
+                return false;
+            }
+
+            const versions = {};
+            for (const shard of stored) {
+                if (shard.version) {
+                    versions[shard.key] = shard.version;
+                }
+            }
+
+            this.updateProgress('同步数据库数据...', 30);
+            const response = await fetch('/id-sync', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ versions })
+            });
+            if (!response.ok) {
+                // 如python -m http.server不支持POST
+                return false;
+            }
+            const delta = await response.json();
+
+            const changed = delta.shards.map(shard => this.createShard(
+                shard.type,
+                shard.source,
+                shard.sourceType,
+                shard.version,
+                shard.records
+            ));
+            if ((changed.length > 0 || delta.removed.length > 0) &&
+                !(await this.updateShardsInIndexedDB(changed, delta.removed))) {
+                return false;
+            }
+
+            // 本地分片加上增量即为完整的分片集合
+            const shards = new Map(stored.map(shard => [shard.key, shard]));
+            for (const key of delta.removed) {
+                shards.delete(key);
+            }
+            for (const shard of changed) {
+                shards.set(shard.key, shard);
+            }
+            this.updateProgress('重建数据库...', 60);
+            this.rebuildFromShards(Array.from(shards.values()));
+            this.syncEnabled = true;
+            console.log(`[IdDatabase] 分片同步完成: 更新${changed.length}个，删除${delta.removed.length}个，未变化${delta.unchanged}个`);
+
+            // 整体存储的旧数据已由分片取代
+            await this.removeLegacyStorage();
+            return true;
+        } catch (error) {
+            console.warn('[IdDatabase] 分片同步失败，使用整体存储:', error);
+            return false;
+        }
+    }
+
+    /**
+     * 按优先级从分片重建数据库，DLC分片只有被载入（activeDlcShards）后才参与
+     * @param {Array<Object>} shards 分片列表
+     * @param {string} type 只重建该类型（可选，不指定则重建全部）
+     */
+    rebuildFromShards(shards, type = null) {
+        this.clear(type);
+        if (!type) {
+            this.shardVersions.clear();
+        }
+
+        const ordered = [];
+        for (const shard of shards) {
+            if (!this.idTypes[shard.type] || (type && shard.type !== type)) {
+                continue;
+            }
+            // 未载入的DLC分片也记录版本，启用时用于版本检查
+            if (shard.version) {
+                this.shardVersions.set(shard.key, shard.version);
+            }
+            if (shard.sourceType !== 'dlc' || this.activeDlcShards.has(shard.key)) {
+                ordered.push(shard);
+            }
+        }
+        ordered.sort((a, b) => a.priority - b.priority || a.updatedAt.localeCompare(b.updatedAt));
+
+        for (const shard of ordered) {
+            const typeConfig = this.idTypes[shard.type];
+            this.batchAddToMap(this.database.get(shard.type), shard.records.map(([id, name]) => ({
+                id,
+                name: name || typeConfig.displayName || id
+            })));
+            this.sources.get(shard.type).push({
+                source: shard.source,
+                type: shard.sourceType,
+                timestamp: shard.updatedAt
+            });
+        }
+    }
     
     /**
      * 将数据库数据持久化到localStorage
      */
     async persistToStorage() {
         try {
-            // 转换Map为可序列化的对象
+            // 转换Map为可序列化的对象（载入过DLC的类型使用不含DLC的数据）
             const serializedDatabase = {};
             for (const [type, idMap] of this.database.entries()) {
-                serializedDatabase[type] = Array.from(idMap.entries());
+                const base = this.baseMaps.get(type);
+                serializedDatabase[type] = Array.from((base ? base.database : idMap).entries());
             }
             
             const serializedSources = {};
             for (const [type, sourceList] of this.sources.entries()) {
-                serializedSources[type] = sourceList;
+                const base = this.baseMaps.get(type);
+                serializedSources[type] = base ? base.sources : sourceList;
             }
             
             const dataToStore = {
@@ -575,7 +1019,8 @@ class IdDatabase {
                 return;
             }
             
-            const request = indexedDB.open('IdDatabase', 1);
+            // 版本2新增idShards存储（按type|source分片）
+            const request = indexedDB.open('IdDatabase', 2);
             
             request.onerror = () => {
                 reject(new Error('Failed to open IndexedDB'));
@@ -590,9 +1035,100 @@ class IdDatabase {
                 if (!db.objectStoreNames.contains('idDatabase')) {
                     db.createObjectStore('idDatabase');
                 }
+                if (!db.objectStoreNames.contains('idShards')) {
+                    const shardStore = db.createObjectStore('idShards', { keyPath: 'key' });
+                    shardStore.createIndex('type', 'type');
+                }
             };
         });
     }
+
+    /**
+     * 从IndexedDB读取分片
+     * @param {string} type 只读取该类型的分片（可选）
+     * @returns {Promise<Array<Object>|null>} 分片列表，IndexedDB不可用时为null
+     */
+    async getShardsFromIndexedDB(type = null) {
+        try {
+            const db = await this.openIndexedDB();
+            return new Promise((resolve) => {
+                const transaction = db.transaction('idShards', 'readonly');
+                const store = transaction.objectStore('idShards');
+                const request = type ? store.index('type').getAll(type) : store.getAll();
+
+                request.onsuccess = () => {
+                    resolve(request.result || []);
+                };
+
+                request.onerror = () => {
+                    resolve(null);
+                };
+            });
+        } catch (error) {
+            console.error('[IdDatabase] 从IndexedDB读取分片失败:', error);
+            return null;
+        }
+    }
+
+    /**
+     * 在一个事务中写入和删除分片，只涉及变化的分片
+     * @param {Array<Object>} shards 要写入的分片
+     * @param {Array<string>} removedKeys 要删除的分片键
+     * @returns {Promise<boolean>} 是否成功
+     */
+    async updateShardsInIndexedDB(shards, removedKeys = []) {
+        try {
+            const db = await this.openIndexedDB();
+            return new Promise((resolve) => {
+                const transaction = db.transaction('idShards', 'readwrite');
+                const store = transaction.objectStore('idShards');
+                for (const shard of shards) {
+                    store.put(shard);
+                }
+                for (const key of removedKeys) {
+                    store.delete(key);
+                }
+
+                transaction.oncomplete = () => {
+                    resolve(true);
+                };
+
+                transaction.onerror = () => {
+                    resolve(false);
+                };
+
+                transaction.onabort = () => {
+                    resolve(false);
+                };
+            });
+        } catch (error) {
+            console.error('[IdDatabase] 写入分片到IndexedDB失败:', error);
+            return false;
+        }
+    }
+
+    /**
+     * 删除整体存储的旧数据（idDatabase_data）
+     */
+    async removeLegacyStorage() {
+        try {
+            const db = await this.openIndexedDB();
+            await new Promise((resolve) => {
+                const transaction = db.transaction('idDatabase', 'readwrite');
+                const request = transaction.objectStore('idDatabase').delete('idDatabase_data');
+                request.onsuccess = () => resolve(true);
+                request.onerror = () => resolve(false);
+            });
+        } catch (error) {
+            console.error('[IdDatabase] 删除IndexedDB旧数据失败:', error);
+        }
+
+        try {
+            localStorage.removeItem('idDatabase_data');
+        } catch (error) {
+            console.error('[IdDatabase] 删除localStorage旧数据失败:', error);
+        }
+    }
     
     /**
      * 存储数据到IndexedDB
@@ -956,19 +1492,21 @@ class IdDatabase {
             const db = await this.openIndexedDB();
             if (db) {
                 await new Promise((resolve) => {
-                    const transaction = db.transaction(['idDatabase'], 'readwrite');
-                    const store = transaction.objectStore('idDatabase');
-                    const request = store.clear();
-                    
-                    request.onsuccess = () => {
+                    const transaction = db.transaction(['idDatabase', 'idShards'], 'readwrite');
+                    transaction.objectStore('idDatabase').clear();
+                    transaction.objectStore('idShards').clear();
+
+                    transaction.oncomplete = () => {
                         resolve(true);
                     };
-                    
-                    request.onerror = () => {
+
+                    transaction.onerror = () => {
                         resolve(false);
                     };
                 });
             }
+            this.shardVersions.clear();
+            this.activeDlcShards.clear();
         } catch (error) {
             console.error('[IdDatabase] 清空IndexedDB失败:', error);
         }
@@ -0,0 +1,521 @@
+// 字段规则校验模块
+// 将idTypeKeys.json中每个字段的status/rule编译为各类型的校验器，
+// 在Web Worker中并行校验所有模组的记录，并流式返回校验结果
+// 本文件同时被主线程（index.html）和schemaValidatorWorker.js通过importScripts加载
+
+// 游戏数据中表示“不限/永不”的占位ID（如ShopKey.discountRound的999），不作为引用检查
+const SCHEMA_SENTINEL_IDS = new Set(['999', '9999']);
+
+class SchemaValidator {
+    constructor() {
+        // 字段定义（idTypeKeys.json）
+        this.idTypeKeys = null;
+        // ID类型定义（idTypelib.json）
+        this.idTypelib = null;
+        // 每个Worker每次处理的记录数
+        this.batchSize = 500;
+        // 最大Worker数量
+        this.maxWorkers = 8;
+        // Worker脚本路径
+        this.workerUrl = 'js/core/schemaValidatorWorker.js';
+        // 当前正在运行的Worker
+        this.workers = [];
+        // 当前的校验运行 { cancelled, cancel }，新的校验开始时取消旧的
+        this.activeRun = null;
+    }
+
+    /**
+     * 加载idTypeKeys.json和idTypelib.json
+     * @returns {Promise<boolean>} 加载是否成功
+     */
+    async loadSchema() {
+        try {
+            const [keysResponse, libResponse] = await Promise.all([
+                fetch('lib/idTypeKeys.json', { cache: 'no-cache' }),
+                fetch('lib/idTypelib.json', { cache: 'no-cache' })
+            ]);
+            if (!keysResponse.ok || !libResponse.ok) {
+                console.error('[SchemaValidator] 无法加载idTypeKeys.json或idTypelib.json');
+                return false;
+            }
+            this.idTypeKeys = await keysResponse.json();
+            this.idTypelib = await libResponse.json();
+            return true;
+        } catch (error) {
+            console.error('[SchemaValidator] 加载字段定义出错:', error);
+            return false;
+        }
+    }
+
+    /**
+     * 获取传给Worker的字段定义
+     * @returns {Object} 字段定义
+     */
+    getSchema() {
+        return {
+            idTypeKeys: this.idTypeKeys || {},
+            listType: (this.idTypelib && this.idTypelib.listType) || {},
+            allType: (this.idTypelib && this.idTypelib.allType) || {}
+        };
+    }
+
+    /**
+     * 将单个ID规则（如ItemTypeId、itemId、personStateID）解析为idDatabase中的类型名
+     * @param {string} rule 单个ID规则
+     * @param {Object} allType idTypelib.json中的allType
+     * @returns {string|null} idDatabase中的类型名，不是ID规则时返回null
+     */
+    static resolveIdType(rule, allType) {
+        const lowerRule = rule.toLowerCase();
+        for (const typeId of Object.keys(allType)) {
+            if (typeId.toLowerCase() === lowerRule) {
+                return Utils.toSnakeCase(typeId.replace('Id', ''));
+            }
+        }
+        return null;
+    }
+
+    /**
+     * 将字段规则编译为校验函数
+     * @param {string} key 字段名
+     * @param {Object} attrConfig 字段定义（name/status/rule）
+     * @param {Object} allType idTypelib.json中的allType
+     * @returns {Object} { key, name, required, idTypes, check }
+     */
+    static compileField(key, attrConfig, allType) {
+        const rule = attrConfig.rule || '';
+        const field = {
+            key,
+            name: attrConfig.name || key,
+            required: attrConfig.status === 'required',
+            idTypes: null,
+            check: null
+        };
+
+        switch (rule) {
+            case 'index':
+                field.check = (value) => SchemaValidator.isInteger(value) ? null : '应为整数ID';
+                break;
+            case 'number':
+                field.check = (value) => SchemaValidator.isNumeric(value) ? null : '应为数字';
+                break;
+            // text/path描述的是编辑器控件而非数据类型，游戏数据中也有整数值（如finishType、isVip），只排除对象和布尔值
+            case 'text':
+                field.check = (value) => SchemaValidator.isScalarOrArray(value) ? null : '应为文本';
+                break;
+            case 'path':
+                field.check = (value) => SchemaValidator.isScalarOrArray(value) ? null : '应为路径';
+                break;
+            case 'effectRules':
+            case 'conditionRules':
+                field.check = (value) => Array.isArray(value) ? null : '应为规则数组';
+                break;
+            default: {
+                // 替换类规则（xxxReplace）格式自由，不做检查
+                if (rule.endsWith('Replace')) {
+                    break;
+                }
+                // ID类规则，支持A//B备选写法
+                const idTypes = rule.split('//')
+                    .map(t => t.trim())
+                    .filter(t => t)
+                    .map(t => SchemaValidator.resolveIdType(t, allType))
+                    .filter(t => t);
+                // id字段是记录自身的主键（如ShopKey.id与物品ID一致），不检查引用
+                if (idTypes.length > 0 && key !== 'id') {
+                    field.idTypes = idTypes;
+                }
+                break;
+            }
+        }
+
+        return field;
+    }
+
+    /**
+     * 将idTypeKeys.json编译为各类型的校验器
+     * @param {Object} schema { idTypeKeys, listType, allType }
+     * @returns {Map<string, Array<Object>>} 类型名 => 字段校验器列表
+     */
+    static compile(schema) {
+        const checkers = new Map();
+        const { idTypeKeys, listType, allType } = schema;
+
+        for (const [typeId, typeConfig] of Object.entries(listType)) {
+            const attributes = idTypeKeys[typeConfig.keyList];
+            if (!attributes) {
+                continue;
+            }
+            const typeName = Utils.toSnakeCase(typeId.replace('Id', ''));
+            const fields = [];
+            for (const [key, attrConfig] of Object.entries(attributes)) {
+                if (attrConfig.status === 'hide') {
+                    continue;
+                }
+                fields.push(SchemaValidator.compileField(key, attrConfig, allType));
+            }
+            checkers.set(typeName, fields);
+        }
+
+        return checkers;
+    }
+
+    /**
+     * 校验一批记录
+     * @param {Array<Object>} fields 字段校验器列表
+     * @param {Array<Object>} records 记录列表（extractKeyAttributes提取后的数据）
+     * @param {Map<string, Set<string>>} idIndex 全局ID索引
+     * @param {string} modName 模组名称
+     * @param {string} type 类型名
+     * @returns {Array<Object>} 校验结果
+     */
+    static validateRecords(fields, records, idIndex, modName, type) {
+        const findings = [];
+        if (!fields) {
+            return findings;
+        }
+
+        for (const record of records) {
+            const recordId = record.id;
+            for (const field of fields) {
+                const value = record[field.key];
+
+                if (value === undefined || value === null || value === '') {
+                    if (field.required) {
+                        findings.push({
+                            mod: modName, type, id: recordId, field: field.key, fieldName: field.name,
+                            level: 'error', code: 'missing', message: `缺少必填字段${field.name}`
+                        });
+                    }
+                    continue;
+                }
+
+                if (field.check) {
+                    const message = field.check(value);
+                    if (message) {
+                        findings.push({
+                            mod: modName, type, id: recordId, field: field.key, fieldName: field.name,
+                            level: 'error', code: 'format', message: `${field.name}${message}`, value
+                        });
+                    }
+                }
+
+                if (field.idTypes) {
+                    // 只检查已加载索引的类型，避免索引缺失导致误报
+                    const indexes = field.idTypes.map(t => idIndex.get(t)).filter(set => set && set.size > 0);
+                    if (indexes.length === 0) {
+                        continue;
+                    }
+                    for (const refId of SchemaValidator.flattenIds(value)) {
+                        if (SCHEMA_SENTINEL_IDS.has(refId)) {
+                            continue;
+                        }
+                        if (!indexes.some(set => set.has(refId))) {
+                            findings.push({
+                                mod: modName, type, id: recordId, field: field.key, fieldName: field.name,
+                                level: 'warning', code: 'unknownId', message: `${field.name}引用的ID ${refId} 不存在`, value: refId
+                            });
+                        }
+                    }
+                }
+            }
+        }
+
+        return findings;
+    }
+
+    /**
+     * 展开字段中引用的ID（支持数字、逗号分隔字符串、嵌套数组），忽略0和负数占位值
+     * @param {*} value 字段值
+     * @returns {Array<string>} ID字符串列表
+     */
+    static flattenIds(value) {
+        const ids = [];
+        const visit = (v) => {
+            if (Array.isArray(v)) {
+                v.forEach(visit);
+            } else if (typeof v === 'number') {
+                if (v > 0) ids.push(String(v));
+            } else if (typeof v === 'string') {
+                for (const part of v.split(',')) {
+                    const trimmed = part.trim();
+                    if (trimmed && SchemaValidator.isNumeric(trimmed) && Number(trimmed) > 0) {
+                        ids.push(String(Number(trimmed)));
+                    }
+                }
+            }
+        };
+        visit(value);
+        return ids;
+    }
+
+    /**
+     * 判断值是否为整数（允许数字字符串）
+     * @param {*} value 值
+     * @returns {boolean} 是否为整数
+     */
+    static isInteger(value) {
+        return SchemaValidator.isNumeric(value) && Number.isInteger(Number(value));
+    }
+
+    /**
+     * 判断值是否为数字（允许数字字符串）
+     * @param {*} value 值
+     * @returns {boolean} 是否为数字
+     */
+    static isNumeric(value) {
+        if (typeof value === 'number') {
+            return Number.isFinite(value);
+        }
+        return typeof value === 'string' && value.trim() !== '' && Number.isFinite(Number(value));
+    }
+
+    /**
+     * 判断值是否为字符串、数字或数组
+     * @param {*} value 值
+     * @returns {boolean} 是否为标量（不含布尔值）或数组
+     */
+    static isScalarOrArray(value) {
+        return typeof value === 'string' || typeof value === 'number' || Array.isArray(value);
+    }
+
+    /**
+     * 从idDatabase构建全局ID索引（ID统一为字符串）
+     * @param {IdDatabase} database ID数据库
+     * @returns {Map<string, Set<string>>} 类型名 => ID集合
+     */
+    buildIdIndex(database) {
+        const idIndex = new Map();
+        if (!database || !database.database) {
+            return idIndex;
+        }
+        for (const [type, idMap] of database.database.entries()) {
+            const ids = new Set();
+            for (const id of idMap.keys()) {
+                ids.add(String(id));
+            }
+            idIndex.set(type, ids);
+        }
+        return idIndex;
+    }
+
+    /**
+     * 将模组详情切分为校验任务
+     * @param {Map} modDetails 模组详情 modName => { path, types... }
+     * @param {Map<string, Array<Object>>} checkers 类型校验器
+     * @param {boolean} includeOfficial 是否包含baseGame和DLC
+     * @returns {Array<Object>} 任务列表 { mod, type, records }
+     */
+    createJobs(modDetails, checkers, includeOfficial) {
+        const jobs = [];
+        for (const [modName, modDetail] of modDetails.entries()) {
+            const path = modDetail.path || '';
+            if (!includeOfficial && (path === 'baseGame' || path.startsWith('dlc/'))) {
+                continue;
+            }
+            for (const type of checkers.keys()) {
+                const records = modDetail[type + 's'];
+                if (!records || records.length === 0) {
+                    continue;
+                }
+                for (let i = 0; i < records.length; i += this.batchSize) {
+                    jobs.push({ mod: modName, type, records: records.slice(i, i + this.batchSize) });
+                }
+            }
+        }
+        return jobs;
+    }
+
+    /**
+     * 校验所有模组的记录
+     * @param {Map} modDetails 模组详情（EventAnalyzer分析结果中的modDetails）
+     * @param {Object} options 选项
+     * @param {Function} options.onFindings 每批校验结果的回调 (findings) => void
+     * @param {Function} options.onProgress 进度回调 (processed, total) => void
+     * @param {boolean} options.includeOfficial 是否校验baseGame和DLC，默认false
+     * @returns {Promise<Object>} 汇总 { records, errors, warnings }，被新的校验取代时以AbortError拒绝
+     */
+    async validate(modDetails, options = {}) {
+        const { onFindings = null, onProgress = null, includeOfficial = false } = options;
+
+        // 取消仍在进行的上一次校验，其结果不再回调
+        this.cancel();
+        const run = { cancelled: false, cancel: null };
+        this.activeRun = run;
+        const checkCancelled = () => {
+            if (run.cancelled) {
+                throw SchemaValidator.createAbortError();
+            }
+        };
+
+        if (!this.idTypeKeys || !this.idTypelib) {
+            await this.loadSchema();
+            checkCancelled();
+        }
+
+        const schema = this.getSchema();
+        const checkers = SchemaValidator.compile(schema);
+        const idIndex = this.buildIdIndex(window.idDatabase);
+        const jobs = this.createJobs(modDetails, checkers, includeOfficial);
+
+        const summary = { records: 0, errors: 0, warnings: 0 };
+        let processed = 0;
+
+        const handleResult = (job, findings) => {
+            if (run.cancelled) {
+                return;
+            }
+            processed++;
+            summary.records += job.records.length;
+            for (const finding of findings) {
+                if (finding.level === 'error') {
+                    summary.errors++;
+                } else {
+                    summary.warnings++;
+                }
+            }
+            if (findings.length > 0 && onFindings) {
+                onFindings(findings);
+            }
+            if (onProgress) {
+                onProgress(processed, jobs.length);
+            }
+        };
+
+        if (jobs.length === 0) {
+            this.finishRun(run);
+            return summary;
+        }
+
+        if (typeof Worker === 'undefined' || window.location.protocol === 'file:') {
+            // 不支持Worker时在主线程逐批校验，每批之间让出主线程
+            for (const job of jobs) {
+                handleResult(job, SchemaValidator.validateRecords(checkers.get(job.type), job.records, idIndex, job.mod, job.type));
+                await new Promise(resolve => setTimeout(resolve, 0));
+                checkCancelled();
+            }
+            this.finishRun(run);
+            return summary;
+        }
+
+        await this.runInWorkers(schema, idIndex, jobs, handleResult, run);
+        this.finishRun(run);
+        return summary;
+    }
+
+    /**
+     * 取消当前的校验：终止Worker并以AbortError结束其Promise
+     */
+    cancel() {
+        const run = this.activeRun;
+        if (!run) {
+            return;
+        }
+        run.cancelled = true;
+        this.activeRun = null;
+        if (run.cancel) {
+            run.cancel();
+        } else {
+            this.terminate();
+        }
+    }
+
+    /**
+     * 校验正常结束时清除当前运行记录
+     * @param {Object} run 校验运行
+     */
+    finishRun(run) {
+        if (this.activeRun === run) {
+            this.activeRun = null;
+        }
+    }
+
+    /**
+     * 创建表示校验被取代的错误
+     * @returns {Error} name为AbortError的错误
+     */
+    static createAbortError() {
+        const error = new Error('校验已被新的分析取代');
+        error.name = 'AbortError';
+        return error;
+    }
+
+    /**
+     * 在Worker池中并行执行校验任务
+     * @param {Object} schema 字段定义
+     * @param {Map<string, Set<string>>} idIndex 全局ID索引
+     * @param {Array<Object>} jobs 任务列表
+     * @param {Function} handleResult 单个任务完成的回调 (job, findings) => void
+     * @param {Object} run 校验运行，取消时终止Worker并拒绝Promise
+     */
+    runInWorkers(schema, idIndex, jobs, handleResult, run) {
+        const workerCount = Math.max(1, Math.min(navigator.hardwareConcurrency || 4, this.maxWorkers, jobs.length));
+        let nextJob = 0;
+        let finished = 0;
+
+        return new Promise((resolve, reject) => {
+            run.cancel = () => {
+                this.terminate();
+                reject(SchemaValidator.createAbortError());
+            };
+
+            const dispatch = (worker) => {
+                if (nextJob >= jobs.length) {
+                    return;
+                }
+                const jobId = nextJob++;
+                const job = jobs[jobId];
+                worker.postMessage({ action: 'validate', jobId, mod: job.mod, type: job.type, records: job.records });
+            };
+
+            for (let i = 0; i < workerCount; i++) {
+                const worker = new Worker(this.workerUrl);
+                worker.onmessage = (e) => {
+                    if (run.cancelled) {
+                        return;
+                    }
+                    const message = e.data;
+                    if (message.action === 'ready') {
+                        dispatch(worker);
+                    } else if (message.action === 'result') {
+                        handleResult(jobs[message.jobId], message.findings);
+                        finished++;
+                        if (finished === jobs.length) {
+                            this.terminate();
+                            resolve();
+                        } else {
+                            dispatch(worker);
+                        }
+                    }
+                };
+                worker.onerror = (error) => {
+                    if (run.cancelled) {
+                        return;
+                    }
+                    console.error('[SchemaValidator] Worker出错:', error);
+                    this.terminate();
+                    this.finishRun(run);
+                    reject(new Error(error.message || 'Worker出错'));
+                };
+                // 字段定义和ID索引只在初始化时传输一次
+                worker.postMessage({ action: 'init', schema, idIndex });
+                this.workers.push(worker);
+            }
+        });
+    }
+
+    /**
+     * 终止所有Worker
+     */
+    terminate() {
+        for (const worker of this.workers) {
+            worker.terminate();
+        }
+        this.workers = [];
+    }
+}
+
+// 暴露为全局变量（Worker环境中只提供类本身）
+if (typeof window !== 'undefined') {
+    window.schemaValidator = new SchemaValidator();
+}
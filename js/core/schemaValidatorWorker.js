@@ -0,0 +1,26 @@
+// 字段规则校验Worker
+// 由SchemaValidator创建，接收init消息编译校验器，再逐批处理validate消息
+
+importScripts('utils.js', 'schemaValidator.js');
+
+let checkers = null;
+let idIndex = null;
+
+self.onmessage = (e) => {
+    const message = e.data;
+
+    if (message.action === 'init') {
+        checkers = SchemaValidator.compile(message.schema);
+        idIndex = message.idIndex;
+        self.postMessage({ action: 'ready' });
+    } else if (message.action === 'validate') {
+        const findings = SchemaValidator.validateRecords(
+            checkers.get(message.type),
+            message.records,
+            idIndex,
+            message.mod,
+            message.type
+        );
+        self.postMessage({ action: 'result', jobId: message.jobId, findings });
+    }
+};
@@ -260,6 +260,13 @@ class ResultRenderer {
         this.progressSection = document.getElementById('progress-section');
         this.progressFill = document.getElementById('progress-fill');
         this.progressText = document.getElementById('progress-text');
+        this.validationSection = document.getElementById('validation-section');
+        this.validationList = document.getElementById('validation-list');
+        this.validationStats = document.getElementById('validation-stats');
+        
+        // 字段校验结果最多显示的条数，避免大量结果撑爆DOM
+        this.maxValidationRows = 500;
+        this.validationRowCount = 0;
         
         this.initCustomTooltip();
     }
@@ -530,6 +537,69 @@ class ResultRenderer {
         this.renderSummary(result);
     }
     
+    /**
+     * 清空字段校验结果
+     */
+    resetValidationResults() {
+        if (!this.validationSection) return;
+        this.validationRowCount = 0;
+        this.validationList.innerHTML = '';
+        this.validationStats.textContent = '校验中...';
+        this.validationSection.style.display = 'block';
+    }
+    
+    /**
+     * 追加一批字段校验结果（由SchemaValidator流式回调）
+     * @param {Array<Object>} findings - 校验结果
+     */
+    appendValidationFindings(findings) {
+        if (!this.validationList) return;
+        
+        const remaining = this.maxValidationRows - this.validationRowCount;
+        if (remaining <= 0) return;
+        
+        const fragment = document.createDocumentFragment();
+        for (const finding of findings.slice(0, remaining)) {
+            const row = document.createElement('div');
+            row.className = 'module-item';
+            const color = finding.level === 'error' ? 'var(--danger-color)' : '#856404';
+            row.innerHTML = `
+                <div>
+                    <div class="module-name" style="color: ${color};"></div>
+                    <div class="module-path"></div>
+                </div>
+            `;
+            // 模组数据使用textContent写入，避免其中的HTML被解析
+            row.querySelector('.module-name').textContent = `${finding.level === 'error' ? '错误' : '警告'}：${finding.message}`;
+            row.querySelector('.module-path').textContent = `${finding.mod} / ${finding.type} / ID: ${finding.id} / ${finding.field}`;
+            fragment.appendChild(row);
+        }
+        this.validationRowCount += Math.min(findings.length, remaining);
+        this.validationList.appendChild(fragment);
+    }
+    
+    /**
+     * 显示字段校验汇总
+     * @param {Object} summary - 汇总 { records, errors, warnings }
+     */
+    renderValidationSummary(summary) {
+        if (!this.validationStats) return;
+        const total = summary.errors + summary.warnings;
+        let text = `已校验 ${summary.records} 条记录，错误 ${summary.errors} 个，警告 ${summary.warnings} 个`;
+        if (total > this.validationRowCount) {
+            text += `（仅显示前 ${this.validationRowCount} 条）`;
+        }
+        this.validationStats.textContent = text;
+        if (total === 0) {
+            this.validationList.innerHTML = `
+                <div class="empty-state">
+                    <div class="empty-icon">✅</div>
+                    <div>所有字段均符合规则</div>
+                </div>
+            `;
+        }
+    }
+    
     /**
      * 渲染所有类型的重复ID
      * @param {Object} result - 分析结果
@@ -0,0 +1 @@
+"""Server-side helpers used by start_server.py"""
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Shared helpers for reading idTypelib.json and Cfg files on the server"""
+
+import hashlib
+import json
+import os
+import re
+
+
+ID_TYPELIB_PATH = 'lib/idTypelib.json'
+
+
+def to_snake_case(name):
+    """Convert CamelCase to snake_case, matching Utils.toSnakeCase in the browser"""
+    return re.sub(r'([A-Z])', lambda m: '_' + m.group(1).lower(), name).lstrip('_')
+
+
+def load_id_types(id_typelib_path=ID_TYPELIB_PATH):
+    """Load allType from idTypelib.json as {type name: (file pattern, data key)}"""
+    with open(id_typelib_path, 'r', encoding='utf-8') as f:
+        all_type = json.load(f).get('allType', {})
+    return {
+        to_snake_case(type_id.replace('Id', '', 1)): (config['file'], config.get('dataKey', 'name'))
+        for type_id, config in all_type.items()
+    }
+
+
+def read_cfg(path):
+    """Read a Cfg json file, dropping control characters like IdDatabase.cleanJsonString"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        content = f.read()
+    return json.loads(re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', content))
+
+
+def extract_records(paths, data_key):
+    """Collect [id, name] pairs from Cfg files the same way IdDatabase.processData does"""
+    records = []
+    for path in paths:
+        try:
+            data = read_cfg(path)
+        except (OSError, ValueError):
+            continue
+        for item in data.values():
+            if not isinstance(item, dict) or item.get('id') is None:
+                continue
+            name = item.get(data_key)
+            if isinstance(name, list):
+                name = name[0] if name else None
+            records.append([item['id'], name])
+    return records
+
+
+# (path, mtime_ns, size) => sha1 of the file content
+_file_hashes = {}
+
+
+def files_version(paths, extra=''):
+    """Short hash identifying the content of a list of files"""
+    digest = hashlib.sha1(extra.encode('utf-8'))
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        file_hash = _file_hashes.get(key)
+        if file_hash is None:
+            with open(path, 'rb') as f:
+                file_hash = hashlib.sha1(f.read()).hexdigest()
+            _file_hashes[key] = file_hash
+        digest.update(os.path.basename(path).encode('utf-8'))
+        digest.update(file_hash.encode('ascii'))
+    return digest.hexdigest()[:16]
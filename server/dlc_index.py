@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+DLC discovery and per-DLC index shards
+
+Every dlc/<name>/Cfgs/<lang> folder is discovered automatically. The
+manifest lists, for each DLC and language, which ID types have a Cfg
+file there; the browser then fetches the shards (the id/name pairs of one
+type from one DLC) of a DLC only when that DLC takes part in an analysis.
+"""
+
+import fnmatch
+import os
+import threading
+
+from server.cfg import ID_TYPELIB_PATH, load_id_types, extract_records, files_version
+
+
+DLC_ROOT = 'dlc'
+
+
+class DlcIndex:
+    """Discover DLC folders and build per-DLC, per-type index shards"""
+
+    def __init__(self, root=DLC_ROOT, id_typelib_path=ID_TYPELIB_PATH):
+        self.root = root
+        self.id_typelib_path = id_typelib_path
+        self._manifest = None
+        self._signature = None
+        self._shards = {}
+        self._lock = threading.Lock()
+
+    def _scan_signature(self):
+        """Modification times of every Cfgs/<lang> folder, used to invalidate caches"""
+        signature = [os.path.getmtime(self.id_typelib_path)]
+        if not os.path.isdir(self.root):
+            return tuple(signature)
+        signature.append(os.path.getmtime(self.root))
+        for dlc_name in sorted(os.listdir(self.root)):
+            cfgs_dir = os.path.join(self.root, dlc_name, 'Cfgs')
+            if not os.path.isdir(cfgs_dir):
+                continue
+            for lang in sorted(os.listdir(cfgs_dir)):
+                lang_dir = os.path.join(cfgs_dir, lang)
+                if os.path.isdir(lang_dir):
+                    signature.append((dlc_name, lang, os.path.getmtime(lang_dir)))
+        return tuple(signature)
+
+    def manifest(self):
+        """Return the DLC manifest, rescanning only when a folder changed"""
+        signature = self._scan_signature()
+        with self._lock:
+            if self._manifest is not None and signature == self._signature:
+                return self._manifest
+
+            id_types = load_id_types(self.id_typelib_path)
+            dlcs = []
+            if os.path.isdir(self.root):
+                for dlc_name in sorted(os.listdir(self.root)):
+                    cfgs_dir = os.path.join(self.root, dlc_name, 'Cfgs')
+                    if not os.path.isdir(cfgs_dir):
+                        continue
+                    langs = {}
+                    for lang in sorted(os.listdir(cfgs_dir)):
+                        lang_dir = os.path.join(cfgs_dir, lang)
+                        if not os.path.isdir(lang_dir):
+                            continue
+                        files = sorted(name for name in os.listdir(lang_dir) if name.lower().endswith('.json'))
+                        types = {}
+                        for type_name, (pattern, _) in id_types.items():
+                            matched = [name for name in files if fnmatch.fnmatch(name.lower(), pattern.lower())]
+                            if matched:
+                                types[type_name] = matched
+                        langs[lang] = {'files': files, 'types': types}
+                    if langs:
+                        dlcs.append({'name': dlc_name, 'path': f'{self.root}/{dlc_name}', 'langs': langs})
+
+            self._manifest = {'dlcs': dlcs}
+            self._signature = signature
+            self._shards.clear()
+            return self._manifest
+
+    def shard(self, dlc_name, lang, type_name):
+        """Return the id/name pairs of one type from one DLC, or None if it does not exist"""
+        manifest = self.manifest()
+        dlc = next((d for d in manifest['dlcs'] if d['name'] == dlc_name), None)
+        if dlc is None or lang not in dlc['langs']:
+            return None
+        files = dlc['langs'][lang]['types'].get(type_name)
+        if not files:
+            return None
+
+        _, data_key = load_id_types(self.id_typelib_path)[type_name]
+        paths = [os.path.join(self.root, dlc_name, 'Cfgs', lang, file_name) for file_name in files]
+        # Directory mtimes miss in-place edits, so the cache is keyed by file content too
+        version = files_version(paths, data_key)
+
+        key = (dlc_name, lang, type_name)
+        with self._lock:
+            cached = self._shards.get(key)
+        if cached is not None and cached['version'] == version:
+            return cached
+
+        result = {
+            'dlc': dlc_name,
+            'lang': lang,
+            'type': type_name,
+            'source': f'{self.root}/{dlc_name}/Cfgs/{lang}',
+            'version': version,
+            'records': extract_records(paths, data_key),
+        }
+        with self._lock:
+            self._shards[key] = result
+        return result
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Versioned delta sync for the browser's ID database
+
+The default ID data (lib/Cfg and baseGame/Cfgs/zh-cn) is split into one
+shard per source folder and ID type. Each shard carries a version hashed
+from its Cfg files, so a client that sends the versions it already has
+receives only the shards that changed and the keys that were removed.
+"""
+
+import fnmatch
+import os
+import threading
+
+from server.cfg import ID_TYPELIB_PATH, load_id_types, extract_records, files_version
+
+
+# (source folder, source type), in the order IdDatabase loads them; the
+# source type is the one IdDatabase records for data from that folder
+SYNC_SOURCES = [
+    ('lib/Cfg', 'default'),
+    ('baseGame/Cfgs/zh-cn', 'baseGame'),
+]
+
+
+def shard_key(type_name, source):
+    """Key of a shard, shared with IdDatabase in the browser"""
+    return f'{type_name}|{source}'
+
+
+class IdSync:
+    """Build versioned per-source, per-type shards and compute deltas"""
+
+    def __init__(self, sources=SYNC_SOURCES, id_typelib_path=ID_TYPELIB_PATH):
+        self.sources = sources
+        self.id_typelib_path = id_typelib_path
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def shards(self):
+        """Return {key: shard metadata} for every shard currently on disk"""
+        id_types = load_id_types(self.id_typelib_path)
+        result = {}
+        for source, source_type in self.sources:
+            if not os.path.isdir(source):
+                continue
+            files = sorted(name for name in os.listdir(source) if name.lower().endswith('.json'))
+            for type_name, (pattern, data_key) in id_types.items():
+                matched = [name for name in files if fnmatch.fnmatch(name.lower(), pattern.lower())]
+                if not matched:
+                    continue
+                paths = [os.path.join(source, name) for name in matched]
+                result[shard_key(type_name, source)] = {
+                    'key': shard_key(type_name, source),
+                    'type': type_name,
+                    'source': source,
+                    'sourceType': source_type,
+                    'dataKey': data_key,
+                    'paths': paths,
+                    'version': files_version(paths, data_key),
+                }
+        return result
+
+    def _shard_records(self, meta):
+        """Records of a shard, cached per version"""
+        with self._lock:
+            cached = self._records.get(meta['key'])
+        if cached is not None and cached[0] == meta['version']:
+            return cached[1]
+        records = extract_records(meta['paths'], meta['dataKey'])
+        with self._lock:
+            self._records[meta['key']] = (meta['version'], records)
+        return records
+
+    def sync(self, client_versions):
+        """
+        Compare client versions {key: version} with the shards on disk
+
+        Returns the changed or new shards with their records, the keys the
+        client should delete, and the number of unchanged shards. Keys from
+        sources this server does not manage (DLC shards, user uploads) are
+        left alone.
+        """
+        current = self.shards()
+        managed = tuple(f'|{source}' for source, _ in self.sources)
+
+        changed = []
+        unchanged = 0
+        for key, meta in current.items():
+            if client_versions.get(key) == meta['version']:
+                unchanged += 1
+                continue
+            changed.append({
+                'key': key,
+                'type': meta['type'],
+                'source': meta['source'],
+                'sourceType': meta['sourceType'],
+                'version': meta['version'],
+                'records': self._shard_records(meta),
+            })
+
+        removed = [key for key in client_versions if key.endswith(managed) and key not in current]
+        return {'shards': changed, 'removed': removed, 'unchanged': unchanged}
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+Load test for the local HTTP server
+
+Replays the browser's startup request sequence from N concurrent
+simulated sessions against a freshly started server, once per server
+mode and sequence, and reports latency percentiles, throughput and the
+server's peak RSS. Sequences:
+
+- legacy: config.jsonc, idTypelib, rule files, directory listings, every
+  Cfg and the DLC index/shards (IdDatabase without /id-sync)
+- sync-cold: POST /id-sync with no stored versions, as on a first visit
+- sync-warm: POST /id-sync and /dlc-shard with the current versions, as
+  on a later visit with nothing changed
+
+Usage (from the project root):
+    python -m server.load_test --sessions 8 --modes single,threaded
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
+from server.dlc_index import DlcIndex
+
+
+# Browsers open at most this many connections per host
+BROWSER_CONNECTIONS = 6
+
+# Seconds to wait for a server child process to report READY
+STARTUP_TIMEOUT = 30
+
+SEQUENCES = ('legacy', 'sync-cold', 'sync-warm')
+
+
+def build_startup_sequence(root='.', sync=False):
+    """
+    Build the startup requests as a list of phases
+
+    Each request is a URL path (GET) or a (path, body) tuple (POST). With
+    sync=True IdDatabase's directory listings and Cfg files are replaced
+    by one POST /id-sync with no stored versions.
+    """
+    def listdir(path):
+        full = os.path.join(root, path)
+        return sorted(os.listdir(full)) if os.path.isdir(full) else []
+
+    with open(os.path.join(root, 'lib', 'idTypelib.json'), 'r', encoding='utf-8') as f:
+        patterns = [config['file'].lower() for config in json.load(f)['allType'].values()]
+
+    def is_cfg(name):
+        return any(fnmatch.fnmatch(name.lower(), pattern) for pattern in patterns)
+
+    rule_files = [name for name in listdir('lib/rules')
+                  if name.endswith('.json') and ('Rules' in name or 'Replace' in name)]
+
+    phases = [
+        ['/config.jsonc', '/lib/idTypelib.json', '/lib/idTypeKeys.json', '/lib/data/sprite.json', '/lib/rules/'],
+    ]
+    if sync:
+        phases.append([f'/lib/rules/{name}' for name in rule_files]
+                      + ['/baseGame/', '/dlc-index', ('/id-sync', json.dumps({'versions': {}}).encode('utf-8'))])
+    else:
+        phases.append([f'/lib/rules/{name}' for name in rule_files]
+                      + ['/lib/Cfg/', '/baseGame/', '/baseGame/Cfgs/zh-cn/', '/dlc-index'])
+        phases.append([f'/lib/Cfg/{name}' for name in listdir('lib/Cfg') if is_cfg(name)]
+                      + [f'/baseGame/Cfgs/zh-cn/{name}' for name in listdir('baseGame/Cfgs/zh-cn')
+                         if name.endswith('.json')])
+
+    # DLC Cfg files and index shards, as requested when a DLC is analysed
+    dlc_requests = []
+    manifest = DlcIndex(os.path.join(root, 'dlc'), os.path.join(root, 'lib', 'idTypelib.json')).manifest()
+    for dlc in manifest['dlcs']:
+        lang_info = dlc['langs'].get('zh-cn')
+        if not lang_info:
+            continue
+        dlc_requests += [f'/dlc/{dlc["name"]}/Cfgs/zh-cn/{name}' for name in lang_info['files']]
+        dlc_requests += ['/dlc-shard?' + urlencode({'dlc': dlc['name'], 'lang': 'zh-cn', 'type': type_name})
+                         for type_name in lang_info['types']]
+    if dlc_requests:
+        phases.append(dlc_requests)
+
+    def encode(request):
+        if isinstance(request, tuple):
+            return (quote(request[0], safe='/?=&%'), request[1])
+        return quote(request, safe='/?=&%')
+
+    return [[encode(request) for request in phase] for phase in phases]
+
+
+def request(base_url, item, timeout):
+    """Send one request of a sequence and return the response body"""
+    if isinstance(item, tuple):
+        path, body = item
+        req = urllib.request.Request(base_url + path, data=body, headers={'Content-Type': 'application/json'})
+    else:
+        req = base_url + item
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.read()
+
+
+def warm_sequence(phases, base_url, timeout):
+    """
+    Turn a sync-cold sequence into a sync-warm one
+
+    Runs the versioned requests once to learn the current versions, as a
+    browser would have stored them, then sends those versions instead.
+    """
+    warm = []
+    for phase in phases:
+        warm_phase = []
+        for item in phase:
+            if isinstance(item, tuple) and item[0] == '/id-sync':
+                delta = json.loads(request(base_url, item, timeout))
+                versions = {shard['key']: shard['version'] for shard in delta['shards']}
+                item = (item[0], json.dumps({'versions': versions}).encode('utf-8'))
+            elif isinstance(item, str) and item.startswith('/dlc-shard?'):
+                shard = json.loads(request(base_url, item, timeout))
+                item = item + '&' + urlencode({'version': shard['version']})
+            warm_phase.append(item)
+        warm.append(warm_phase)
+    return warm
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class RssMonitor:
+    """Track the peak resident set size of a process"""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            import psutil
+            self._process = psutil.Process(pid)
+        except Exception:
+            self._process = None
+
+    def _sample(self):
+        if self._process is not None:
+            return self._process.memory_info().rss
+        # Linux without psutil: VmHWM is already the peak
+        try:
+            with open(f'/proc/{self.pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.peak = max(self.peak, self._sample())
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and return the peak RSS in bytes (0 if unavailable)"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        try:
+            self.peak = max(self.peak, self._sample())
+        except Exception:
+            pass
+        return self.peak
+
+
+def _drain(stream):
+    for _ in stream:
+        pass
+
+
+def start_server_process(mode, root, timeout=STARTUP_TIMEOUT):
+    """Start start_server.py's handler in a child process and return (process, port)"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'server.load_test', '--serve', mode],
+        cwd=root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    # Read the first line in a thread so a hung child cannot block the harness
+    lines = []
+    reader = threading.Thread(target=lambda: lines.append(process.stdout.readline()), daemon=True)
+    reader.start()
+    reader.join(timeout)
+    line = lines[0] if lines else ''
+
+    parts = line.split()
+    if len(parts) == 2 and parts[0] == 'READY':
+        # Discard stderr (request logs) from now on so the child never blocks on a full pipe
+        threading.Thread(target=_drain, args=(process.stderr,), daemon=True).start()
+        return process, int(parts[1])
+
+    process.kill()
+    _, stderr = process.communicate()
+    details = stderr.strip() or line.strip() or 'no output'
+    raise RuntimeError(f'Server in mode {mode} failed to start within {timeout}s: {details}')
+
+
+def serve(mode):
+    """Child process entry: run the real server handler on a free port"""
+    import start_server
+    httpd = start_server.create_server(('127.0.0.1', 0), mode)
+    print(f'READY {httpd.server_port}', flush=True)
+    httpd.serve_forever()
+
+
+def run_session(base_url, phases, timeout):
+    """Replay the startup sequence once; return a list of (latency seconds, bytes, ok)"""
+    results = []
+    lock = threading.Lock()
+
+    def fetch(item):
+        start = time.perf_counter()
+        size = 0
+        ok = True
+        try:
+            size = len(request(base_url, item, timeout))
+        except (urllib.error.URLError, OSError):
+            ok = False
+        with lock:
+            results.append((time.perf_counter() - start, size, ok))
+
+    with ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS) as pool:
+        for phase in phases:
+            # Each phase depends on the previous one, as in the browser
+            list(pool.map(fetch, phase))
+    return results
+
+
+def run_mode(mode, sequence, sessions, phases, root, timeout):
+    """Run all sessions of a sequence against a server in the given mode and collect statistics"""
+    process, port = start_server_process(mode, root)
+    monitor = RssMonitor(process.pid)
+    monitor.start()
+    base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        if sequence == 'sync-warm':
+            phases = warm_sequence(phases, base_url, timeout)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            session_results = list(pool.map(lambda _: run_session(base_url, phases, timeout), range(sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        peak_rss = monitor.stop()
+        process.kill()
+        process.wait()
+
+    results = [r for session in session_results for r in session]
+    latencies = [r[0] * 1000 for r in results if r[2]]
+    return {
+        'mode': mode,
+        'sequence': sequence,
+        'sessions': sessions,
+        'requests': len(results),
+        'errors': sum(1 for r in results if not r[2]),
+        'elapsed': elapsed,
+        'throughput': len(results) / elapsed if elapsed else 0.0,
+        'megabytesPerSecond': sum(r[1] for r in results) / elapsed / 1024 / 1024 if elapsed else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'peakRssMb': peak_rss / 1024 / 1024 if peak_rss else None,
+    }
+
+
+def print_report(stats):
+    """Print one line of results per server mode"""
+    print(f'{"mode":<10}{"sequence":<11}{"sessions":>9}{"requests":>10}{"errors":>8}{"req/s":>9}{"MB/s":>8}'
+          f'{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"peak RSS MB":>13}')
+    for s in stats:
+        rss = f'{s["peakRssMb"]:.1f}' if s['peakRssMb'] is not None else 'n/a'
+        print(f'{s["mode"]:<10}{s["sequence"]:<11}{s["sessions"]:>9}{s["requests"]:>10}{s["errors"]:>8}{s["throughput"]:>9.1f}'
+              f'{s["megabytesPerSecond"]:>8.1f}{s["p50"]:>9.1f}{s["p95"]:>9.1f}{s["p99"]:>9.1f}{rss:>13}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the local HTTP server with concurrent browser sessions')
+    parser.add_argument('--sessions', type=int, default=8, help='number of concurrent simulated sessions')
+    parser.add_argument('--modes', default='single,threaded', help='comma separated server modes to test')
+    parser.add_argument('--sequences', default=','.join(SEQUENCES),
+                        help='comma separated startup sequences to replay: ' + ', '.join(SEQUENCES))
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout in seconds')
+    parser.add_argument('--json', dest='json_path', help='also write the results to this JSON file')
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.sessions < 1:
+        parser.error('--sessions must be at least 1')
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if args.serve:
+        os.chdir(root)
+        serve(args.serve)
+        return
+
+    import start_server
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in modes if m not in start_server.SERVER_MODES]
+    if unknown:
+        parser.error(f'unknown server mode(s): {", ".join(unknown)} '
+                     f'(choose from {", ".join(start_server.SERVER_MODES)})')
+    sequences = [s.strip() for s in args.sequences.split(',') if s.strip()]
+    unknown = [s for s in sequences if s not in SEQUENCES]
+    if unknown:
+        parser.error(f'unknown sequence(s): {", ".join(unknown)} (choose from {", ".join(SEQUENCES)})')
+
+    phase_sets = {}
+    for sequence in sequences:
+        phase_sets[sequence] = build_startup_sequence(root, sync=sequence != 'legacy')
+        phases = phase_sets[sequence]
+        print(f'Startup sequence {sequence}: {sum(len(p) for p in phases)} requests in {len(phases)} phases')
+
+    stats = []
+    for mode in modes:
+        for sequence in sequences:
+            print(f'Testing mode {mode}, sequence {sequence} with {args.sessions} sessions...')
+            stats.append(run_mode(mode, sequence, args.sessions, phase_sets[sequence], root, args.timeout))
+
+    print()
+    print_report(stats)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming report export
+
+The browser posts a compact conflict index (only the duplicated IDs and,
+for detailed reports, the key attributes of each conflicting record).
+Reports are then produced from that index by generators and sent as a
+chunked HTTP response, so memory use does not grow with report size.
+"""
+
+import csv
+import io
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+
+
+# Target size of each chunk written to the socket
+CHUNK_SIZE = 64 * 1024
+
+REPORT_FORMATS = {
+    'markdown': ('text/markdown; charset=utf-8', 'md'),
+    'json': ('application/json; charset=utf-8', 'json'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+
+class ReportStore:
+    """Keep uploaded conflict indexes in memory for a limited time"""
+
+    def __init__(self, max_entries=8, ttl=30 * 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def put(self, conflict_index):
+        """Store a conflict index and return its token"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            # Drop the oldest entries when the store is full
+            while len(self._entries) >= self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[token] = (now, conflict_index)
+        return token
+
+    def get(self, token):
+        """Return the conflict index for token, or None if unknown or expired"""
+        with self._lock:
+            self._expire(time.time())
+            entry = self._entries.get(token)
+        return entry[1] if entry else None
+
+    def discard(self, token):
+        """Drop a conflict index, e.g. once its report has been downloaded"""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def _expire(self, now):
+        expired = [k for k, (created, _) in self._entries.items() if now - created > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+
+def load_field_names(id_type_keys_path='lib/idTypeKeys.json'):
+    """Load display names of every key list field from idTypeKeys.json"""
+    try:
+        with open(id_type_keys_path, 'r', encoding='utf-8') as f:
+            id_type_keys = json.load(f)
+    except Exception:
+        return {}
+    return {
+        key_list: {field: attr.get('name', field) for field, attr in fields.items()}
+        for key_list, fields in id_type_keys.items()
+    }
+
+
+def iter_conflicts(conflict_index):
+    """Yield (type_name, type_info, conflict) for every duplicated ID"""
+    for type_name, type_info in conflict_index.get('types', {}).items():
+        for conflict in type_info.get('conflicts', []):
+            yield type_name, type_info, conflict
+
+
+def summarize(conflict_index):
+    """Return (total conflicts, conflicts per type display name)"""
+    per_type = {}
+    total = 0
+    for type_name, type_info in conflict_index.get('types', {}).items():
+        count = len(type_info.get('conflicts', []))
+        if count:
+            per_type[type_info.get('displayName', type_name)] = count
+            total += count
+    return total, per_type
+
+
+def _mod_info(conflict_index, mod_name):
+    info = conflict_index.get('mods', {}).get(mod_name, {})
+    return info.get('title') or mod_name, info.get('path', '')
+
+
+def _md_cell(value):
+    """Format a value for a markdown table cell"""
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    return value.replace('|', '\\|').replace('\r', '').replace('\n', '<br>')
+
+
+def markdown_report(conflict_index, detailed=False, field_names=None):
+    """Generate a markdown report piece by piece"""
+    field_names = field_names or {}
+    total, per_type = summarize(conflict_index)
+    generated_at = conflict_index.get('generatedAt') or datetime.now().isoformat()
+
+    yield '# 学生时代模组兼容分析报告\n\n'
+    yield f'**生成时间**: {generated_at}\n\n'
+    yield '## 分析摘要\n\n'
+    yield f'- **分析模组数量**: {conflict_index.get("totalMods", 0)}\n'
+    yield f'- **重复ID总数**: {total}\n'
+    for display_name, count in per_type.items():
+        yield f'- **重复{display_name}ID**: {count}\n'
+    yield '\n## 重复ID检测\n\n'
+
+    current_type = None
+    index = 0
+    for type_name, type_info, conflict in iter_conflicts(conflict_index):
+        display_name = type_info.get('displayName', type_name)
+        if type_name != current_type:
+            current_type = type_name
+            index = 0
+            yield f'### {display_name}\n\n'
+        index += 1
+        yield f'#### {index}. {display_name}ID: {conflict["id"]}\n\n'
+        yield '| 模组名称 | 文件路径 |\n|---------|---------|\n'
+        for mod_name in conflict.get('mods', []):
+            title, path = _mod_info(conflict_index, mod_name)
+            yield f'| {_md_cell(title)} | {_md_cell(path)} |\n'
+        yield '\n'
+
+        if detailed:
+            labels = field_names.get(type_info.get('keyList'), {})
+            for mod_name, record in conflict.get('records', {}).items():
+                title, _ = _mod_info(conflict_index, mod_name)
+                yield f'**{_md_cell(title)}**\n\n| 属性 | 值 |\n|------|----|\n'
+                for key, value in record.items():
+                    yield f'| {_md_cell(labels.get(key, key))} | {_md_cell(value)} |\n'
+                yield '\n'
+
+    if total == 0:
+        yield '未检测到重复ID\n'
+
+
+def json_report(conflict_index, detailed=False, field_names=None):
+    """Generate a JSON report piece by piece"""
+    total, per_type = summarize(conflict_index)
+    header = {
+        'timestamp': conflict_index.get('generatedAt') or datetime.now().isoformat(),
+        'summary': {
+            'totalMods': conflict_index.get('totalMods', 0),
+            'duplicateIds': total,
+            'duplicatesByType': per_type,
+        },
+    }
+    # Emit the header without its closing brace, then stream the array
+    yield json.dumps(header, ensure_ascii=False)[:-1]
+    yield ', "duplicateIds": ['
+
+    first = True
+    for type_name, type_info, conflict in iter_conflicts(conflict_index):
+        item = {
+            'type': type_name,
+            'typeName': type_info.get('displayName', type_name),
+            'id': conflict['id'],
+            'modules': [],
+        }
+        for mod_name in conflict.get('mods', []):
+            title, path = _mod_info(conflict_index, mod_name)
+            module = {'moduleName': title, 'modulePath': path}
+            if detailed:
+                module['attributes'] = conflict.get('records', {}).get(mod_name, {})
+            item['modules'].append(module)
+        yield ('' if first else ',') + '\n' + json.dumps(item, ensure_ascii=False)
+        first = False
+
+    yield '\n]}\n'
+
+
+def csv_report(conflict_index, detailed=False, field_names=None):
+    """Generate a CSV report, one row per conflicting record"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    columns = ['type', 'typeName', 'id', 'moduleName', 'modulePath']
+    if detailed:
+        columns.append('attributes')
+    # BOM so that spreadsheet software detects UTF-8
+    yield '\ufeff'
+    writer.writerow(columns)
+    yield flush()
+
+    for type_name, type_info, conflict in iter_conflicts(conflict_index):
+        for mod_name in conflict.get('mods', []):
+            title, path = _mod_info(conflict_index, mod_name)
+            row = [type_name, type_info.get('displayName', type_name), conflict['id'], title, path]
+            if detailed:
+                record = conflict.get('records', {}).get(mod_name, {})
+                row.append(json.dumps(record, ensure_ascii=False))
+            writer.writerow(row)
+            yield flush()
+
+
+REPORT_GENERATORS = {
+    'markdown': markdown_report,
+    'json': json_report,
+    'csv': csv_report,
+}
+
+
+def iter_chunks(pieces, chunk_size=CHUNK_SIZE):
+    """Encode text pieces to UTF-8 and regroup them into chunks of about chunk_size bytes"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        data = piece.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def report_filename(fmt):
+    """Build the download file name for a report format"""
+    timestamp = datetime.now().strftime('%Y-%m-%dT%H-%M-%S')
+    return f'模组分析报告_{timestamp}.{REPORT_FORMATS[fmt][1]}'
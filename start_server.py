@@ -8,6 +8,9 @@ Features:
 2. Automatically find available port if 8000 is occupied
 3. Automatically open browser for access
 4. Support command line port specification
+5. Stream markdown/json/csv conflict reports (see server/reports.py)
+6. Discover dlc/*/Cfgs/<lang> folders and serve per-type index shards (see server/dlc_index.py)
+7. Delta sync of the browser's ID database by versioned shards (see server/id_sync.py)
 """
 
 import os
@@ -15,8 +18,13 @@ import sys
 import socket
 import webbrowser
 import json
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import HTTPServer, ThreadingHTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import urlsplit, parse_qs, quote
+
+from server import reports
+from server.dlc_index import DlcIndex
+from server.id_sync import IdSync
 
 
 def parse_jsonc(file_path):
@@ -50,10 +58,130 @@ def write_jsonc(file_path, data):
 
 class CustomHTTPRequestHandler(SimpleHTTPRequestHandler):
     """Custom HTTP request handler that supports POST requests for updating config"""
+
+    # Conflict indexes uploaded for report export, shared by all requests
+    report_store = reports.ReportStore()
+
+    # Discovered dlc/*/Cfgs/<lang> folders and their index shards
+    dlc_index = DlcIndex()
+
+    # Versioned shards of the default ID data for IdDatabase delta sync
+    id_sync = IdSync()
+
+    def do_GET(self):
+        """Handle GET requests"""
+        url = urlsplit(self.path)
+        if url.path == '/export-report':
+            self.handle_export_report(parse_qs(url.query))
+        elif url.path == '/dlc-index':
+            self.send_json(200, self.dlc_index.manifest())
+        elif url.path == '/dlc-shard':
+            self.handle_dlc_shard(parse_qs(url.query))
+        else:
+            super().do_GET()
+
+    def handle_dlc_shard(self, query):
+        """Send the id/name pairs of one type from one DLC"""
+        dlc_name = query.get('dlc', [''])[0]
+        lang = query.get('lang', ['zh-cn'])[0]
+        type_name = query.get('type', [''])[0]
+        shard = self.dlc_index.shard(dlc_name, lang, type_name)
+        if shard is None:
+            self.send_json(404, {'success': False, 'error': 'Shard not found'})
+        elif shard['version'] == query.get('version', [''])[0]:
+            # The client already has this version
+            self.send_json(200, {'unchanged': True, 'version': shard['version']})
+        else:
+            self.send_json(200, shard)
+
+    def handle_id_sync(self):
+        """Return the ID database shards that changed since the client's versions"""
+        try:
+            content_length = int(self.headers['Content-Length'])
+            body = json.loads(self.rfile.read(content_length) or b'{}')
+            self.send_json(200, self.id_sync.sync(body.get('versions') or {}))
+        except Exception as e:
+            self.send_json(400, {'success': False, 'error': str(e)})
+
+    def send_json(self, status, data):
+        """Send a JSON response"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunked(self, content_type, chunks, filename=None):
+        """Send an HTTP/1.1 chunked response from an iterable of bytes, return True if it completed"""
+        self.protocol_version = 'HTTP/1.1'
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        if filename:
+            self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(filename)}")
+        self.end_headers()
+        self.close_connection = True
+        completed = False
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(f'{len(chunk):X}\r\n'.encode('ascii') + chunk + b'\r\n')
+            completed = True
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client cancelled the download
+        except Exception as e:
+            # Headers are already sent; closing without the terminating chunk
+            # makes the client treat the download as failed, not truncated
+            self.log_error('Streaming response failed: %s', e)
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            if completed:
+                try:
+                    self.wfile.write(b'0\r\n\r\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    completed = False
+        return completed
+
+    def handle_report_session(self):
+        """Store a conflict index posted by the browser and return its token"""
+        try:
+            content_length = int(self.headers['Content-Length'])
+            conflict_index = json.loads(self.rfile.read(content_length))
+            token = self.report_store.put(conflict_index)
+            self.send_json(200, {'success': True, 'token': token})
+        except Exception as e:
+            self.send_json(400, {'success': False, 'error': str(e)})
+
+    def handle_export_report(self, query):
+        """Stream a markdown/json/csv report for a stored conflict index"""
+        token = query.get('token', [''])[0]
+        fmt = query.get('format', ['markdown'])[0]
+        detailed = query.get('detailed', ['0'])[0] in ('1', 'true')
+
+        if fmt not in reports.REPORT_FORMATS:
+            self.send_json(400, {'success': False, 'error': f'Unsupported format: {fmt}'})
+            return
+        conflict_index = self.report_store.get(token)
+        if conflict_index is None:
+            self.send_json(404, {'success': False, 'error': 'Report session not found or expired'})
+            return
+
+        pieces = reports.REPORT_GENERATORS[fmt](conflict_index, detailed, reports.load_field_names())
+        content_type = reports.REPORT_FORMATS[fmt][0]
+        if self.send_chunked(content_type, reports.iter_chunks(pieces), reports.report_filename(fmt)):
+            # Each export posts its own index, so free it once downloaded
+            self.report_store.discard(token)
     
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/update-config':
+        if self.path == '/report-session':
+            self.handle_report_session()
+        elif self.path == '/id-sync':
+            self.handle_id_sync()
+        elif self.path == '/update-config':
             # Get content length
             content_length = int(self.headers['Content-Length'])
             # Read request body
@@ -93,6 +221,34 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# A browser opens up to 6 connections per host, more than the default
+# listen backlog of 5; overflowing connections wait for a SYN retransmit
+REQUEST_QUEUE_SIZE = 128
+
+
+class SingleHTTPServer(HTTPServer):
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class ThreadedHTTPServer(ThreadingHTTPServer):
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+# Server classes selectable with "serverMode" in config.jsonc
+SERVER_MODES = {
+    'single': SingleHTTPServer,
+    'threaded': ThreadedHTTPServer,
+}
+
+
+def create_server(server_address, mode='single'):
+    """Create the HTTP server for the given mode"""
+    if mode not in SERVER_MODES:
+        print(f"Unknown server mode: {mode}, using single", file=sys.stderr)
+        mode = 'single'
+    return SERVER_MODES[mode](server_address, CustomHTTPRequestHandler)
+
+
 def is_port_available(port):
     """Check if port is available"""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -126,10 +282,12 @@ def start_server(port=None):
     # Read version and autoOpenBrowser from config.jsonc
     version = "0.1.0"  # Default version
     auto_open_browser = True  # Default value
+    server_mode = "single"  # Default value
     try:
         config = parse_jsonc("config.jsonc")
         version = config.get("version", "0.1.0")
         auto_open_browser = config.get("autoOpenBrowser", True)
+        server_mode = config.get("serverMode", "single")
     except Exception:
         pass  # Use default values if config file is not available
 
@@ -167,7 +325,7 @@ def start_server(port=None):
 
     # Create and start server
     server_address = ('', port)
-    httpd = HTTPServer(server_address, CustomHTTPRequestHandler)
+    httpd = create_server(server_address, server_mode)
     
     try:
         httpd.serve_forever()